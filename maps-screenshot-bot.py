@@ -1,22 +1,302 @@
 import selenium
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import io
 import time
-import pyautogui
+import math
+import random
+import re
 import numpy as np
 from PIL import Image
 import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Map is ready once the page has loaded, no tile request is in flight and
+# 300 ms have passed since the last camera move and the last tile arrived.
+# A full page load must fetch tiles; a pan whose view is already in Maps'
+# memory requests none, so it only waits out a short grace period.
+MAP_READY_JS = """
+if (document.readyState !== 'complete' || !document.querySelector('.gm-style')) return false;
+if (window.__botmapPending) return false;
+const moved = window.__botmapMovedAt || 0;
+const now = performance.now();
+const ends = performance.getEntriesByType('resource')
+    .filter(r => (r.name.includes('/maps/vt') || r.name.includes('/kh/')) && r.responseEnd > moved)
+    .map(r => r.responseEnd);
+if (!ends.length) return moved > 0 && now - moved > 500;
+return now - Math.max(moved, ...ends) > 300;
+"""
+
+# Move the camera of an already loaded map without reloading the page.
+# The first pan also wraps fetch/XHR to count tile requests in flight.
+MAP_PAN_JS = """
+if (window.__botmapPending === undefined) {
+    window.__botmapPending = 0;
+    const isTile = url => ['/maps/vt', '/kh/'].some(part => String(url).includes(part));
+    const fetch = window.fetch;
+    window.fetch = function (input) {
+        if (!isTile(input && input.url || input)) return fetch.apply(this, arguments);
+        window.__botmapPending++;
+        return fetch.apply(this, arguments).finally(() => window.__botmapPending--);
+    };
+    const open = XMLHttpRequest.prototype.open;
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__botmapTile = isTile(url);
+        return open.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function () {
+        if (this.__botmapTile) {
+            window.__botmapPending++;
+            this.addEventListener('loadend', () => window.__botmapPending--, {once: true});
+        }
+        return send.apply(this, arguments);
+    };
+}
+performance.clearResourceTimings();
+window.__botmapMovedAt = performance.now();
+history.pushState(null, '', arguments[0]);
+window.dispatchEvent(new PopStateEvent('popstate', {state: null}));
+"""
+
+# Headless browser viewport in pixels (width, height); also sets the grid step
+VIEWPORT_SIZE = (1920, 1080)
+
+# Fraction of each screenshot shared with its neighbours, so URL rounding
+# and the map's controls do not leave seams between shots
+GRID_OVERLAP = 0.1
+
+# Centre in a Maps URL, e.g. https://www.google.com/maps/@-7.2465571,112.7384,20z
+MAP_CENTER_RE = re.compile(r"/@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),")
+
+# Screenshot formats: extension, Pillow format name and encoder options.
+# Satellite imagery is photographic, so lossy JPEG/WebP is far smaller than PNG.
+IMAGE_FORMATS = {
+    "jpeg": (".jpg", "JPEG", {"quality": 85, "optimize": False}),
+    "webp": (".webp", "WEBP", {"quality": 90, "method": 4}),
+    "png": (".png", None, None),  # Browser output is saved as is
+}
+
+# Failed attempts (each one costs a browser) before a point is skipped
+POINT_ATTEMPTS = 2
+
+try:
+    import rtree  # Optional: spatial index for kelurahan_containing
+except ImportError:
+    rtree = None
+
+try:
+    from numba import njit  # Optional: compiles the per-point ray cast
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback when numba is missing: run the function as plain Python"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, fastmath=True)
+def _pip(x, y, px, py):
+    """
+    Ray-casting point-in-polygon test for a single point
+    
+    Args:
+        x (float): Latitude of the point
+        y (float): Longitude of the point
+        px (np.ndarray): Contiguous float64 latitudes of the polygon vertices
+            (a list of floats when numba is missing, see Polygon.pip_args)
+        py (np.ndarray): Contiguous float64 longitudes of the polygon vertices
+    """
+    n = len(px)
+    inside = False
+    
+    # Edge (j, i) walks the ring once, j trailing i by one vertex
+    j = n - 1
+    for i in range(n):
+        xi, yi = px[i], py[i]
+        xj, yj = px[j], py[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+        
+    return inside
+
+
+def points_in_polygon(lat, lon, polygon):
+    """
+    Vectorized ray-casting test for many points at once
+
+    Args:
+        lat (np.ndarray): Latitudes of the points to test (any shape)
+        lon (np.ndarray): Longitudes of the points to test (same shape as lat)
+        polygon (list): List of (lat, lon) vertices defining the polygon
+
+    Returns:
+        np.ndarray: Boolean mask with the shape of lat, True where inside
+    """
+    poly = np.asarray(polygon, dtype=np.float64)
+    px, py = poly[:, 0], poly[:, 1]
+    px2, py2 = np.roll(px, -1), np.roll(py, -1)
+
+    # Broadcast points against edges: (..., 1) vs (n_edges,)
+    lat = np.asarray(lat, dtype=np.float64)[..., np.newaxis]
+    lon = np.asarray(lon, dtype=np.float64)[..., np.newaxis]
+
+    crosses = (py > lon) != (py2 > lon)
+    # Horizontal edges divide by zero, but they never cross the ray
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xinters = (px2 - px) * (lon - py) / (py2 - py) + px
+
+    return np.logical_xor.reduce(crosses & (xinters > lat), axis=-1)
+
+
+def _convex_halfplanes(verts):
+    """
+    Half-plane form of a convex polygon: rows (a, b, c) with a*lat + b*lon + c <= 0 inside
+    
+    Args:
+        verts (np.ndarray): (n, 2) polygon vertices without the closing duplicate
+        
+    Returns:
+        np.ndarray: (n, 3) inequality coefficients, or None if not strictly convex
+    """
+    p = verts
+    q = np.roll(verts, -1, axis=0)
+    r = np.roll(verts, -2, axis=0)
+    # Single pass of cross products: all turns must go the same way
+    turns = (q[:, 0] - p[:, 0]) * (r[:, 1] - q[:, 1]) - (q[:, 1] - p[:, 1]) * (r[:, 0] - q[:, 0])
+    if (turns > 0).all():
+        sign = 1.0
+    elif (turns < 0).all():
+        sign = -1.0
+    else:
+        return None
+    
+    # Inside lies to the left of every edge for counter-clockwise rings
+    a = sign * (q[:, 1] - p[:, 1])
+    b = sign * (p[:, 0] - q[:, 0])
+    c = -(a * p[:, 0] + b * p[:, 1])
+    return np.column_stack([a, b, c])
+
+
+def points_in_convex(lat, lon, halfplanes):
+    """
+    Vectorized containment test against a convex polygon's half-planes
+    
+    Args:
+        lat (np.ndarray): 1-D latitudes of the points to test
+        lon (np.ndarray): 1-D longitudes of the points to test
+        halfplanes (np.ndarray): (n, 3) rows from _convex_halfplanes
+        
+    Returns:
+        np.ndarray: Boolean mask, True where inside
+    """
+    homogeneous = np.column_stack([lat, lon, np.ones_like(lat)])
+    return (homogeneous @ halfplanes.T <= 0).all(axis=1)
+
+
+def edges_cross_cells(verts, lat_edges, lon_edges):
+    """
+    Grid cells that a polygon's boundary passes through
+
+    Args:
+        verts (np.ndarray): (n, 2) polygon vertices without the closing duplicate
+        lat_edges (np.ndarray): Increasing cell edges along latitude (n_lat + 1)
+        lon_edges (np.ndarray): Increasing cell edges along longitude (n_lon + 1)
+
+    Returns:
+        np.ndarray: (n_lat, n_lon) boolean mask, True where an edge touches the cell
+    """
+    n_lat, n_lon = len(lat_edges) - 1, len(lon_edges) - 1
+    hit = np.zeros((n_lat, n_lon), dtype=bool)
+    for (x0, y0), (x1, y1) in zip(verts, np.roll(verts, -1, axis=0)):
+        # Only cells within the edge's own bounding box can be crossed
+        i0 = min(max(np.searchsorted(lat_edges, min(x0, x1)) - 1, 0), n_lat - 1)
+        i1 = max(min(np.searchsorted(lat_edges, max(x0, x1)), n_lat), i0 + 1)
+        j0 = min(max(np.searchsorted(lon_edges, min(y0, y1)) - 1, 0), n_lon - 1)
+        j1 = max(min(np.searchsorted(lon_edges, max(y0, y1)), n_lon), j0 + 1)
+
+        # Liang-Barsky clip of the edge against each of those cells
+        lat_lo, lat_hi = lat_edges[i0:i1, None], lat_edges[i0 + 1:i1 + 1, None]
+        lon_lo, lon_hi = lon_edges[None, j0:j1], lon_edges[None, j0 + 1:j1 + 1]
+        dx, dy = x1 - x0, y1 - y0
+        t_in = np.zeros((i1 - i0, j1 - j0))
+        t_out = np.ones((i1 - i0, j1 - j0))
+        outside = np.zeros((i1 - i0, j1 - j0), dtype=bool)
+        for p, q in ((-dx, x0 - lat_lo), (dx, lat_hi - x0), (-dy, y0 - lon_lo), (dy, lon_hi - y0)):
+            q = np.broadcast_to(q, t_in.shape)
+            if p == 0:
+                # Parallel to this side: outside if beyond it
+                outside |= q < 0
+            elif p < 0:
+                t_in = np.maximum(t_in, q / p)
+            else:
+                t_out = np.minimum(t_out, q / p)
+        hit[i0:i1, j0:j1] |= ~outside & (t_in <= t_out)
+    return hit
+
+
+@dataclass(eq=False)
+class Polygon:
+    """
+    Boundary polygon with its derived data computed once
+    
+    Args:
+        verts (list): (lat, lon) vertices, as a list of tuples or an (n, 2) array
+    """
+    verts: np.ndarray
+    bbox: tuple = field(init=False)  # (lat_min, lat_max, lon_min, lon_max)
+    centroid: tuple = field(init=False)  # Mean of the vertices (lat, lon)
+    px: np.ndarray = field(init=False, repr=False)  # Contiguous latitudes
+    py: np.ndarray = field(init=False, repr=False)  # Contiguous longitudes
+    pip_args: tuple = field(init=False, repr=False)  # (px, py) as _pip wants them
+    halfplanes: np.ndarray = field(init=False, repr=False)  # Small convex rings only
+    
+    def __post_init__(self):
+        verts = np.ascontiguousarray(self.verts, dtype=np.float64)
+        # The ray casts close the ring themselves; drop a repeated first vertex
+        if len(verts) > 1 and np.array_equal(verts[0], verts[-1]):
+            verts = verts[:-1]
+        self.verts = verts
+        self.px = np.ascontiguousarray(verts[:, 0])
+        self.py = np.ascontiguousarray(verts[:, 1])
+        self.bbox = (
+            float(self.px.min()),
+            float(self.px.max()),
+            float(self.py.min()),
+            float(self.py.max()),
+        )
+        self.centroid = (float(self.px.mean()), float(self.py.mean()))
+        # Interpreted _pip indexes lists far faster than NumPy scalars
+        if HAVE_NUMBA:
+            self.pip_args = (self.px, self.py)
+        else:
+            self.pip_args = (self.px.tolist(), self.py.tolist())
+        # Quasi-rectangular kelurahan rings: a few multiply-adds per point
+        # beat the branchy ray cast
+        self.halfplanes = _convex_halfplanes(verts) if 3 <= len(verts) <= 5 else None
+
 
 class MapsScreenshotBot:
-    def __init__(self, city, boundary_coords, zoom_level=21):
+    def __init__(self, city, boundary_coords, zoom_level=21, cache_dir=None, image_format="jpeg"):
         """
         Initialize the bot with city name, boundary coordinates, and zoom level
         
         Args:
             city (str): Name of the city to screenshot
-            boundary_coords (list): List of coordinates defining city boundary
+            boundary_coords (Polygon): City boundary, such as the ones in
+                BOUNDARIES_NP; a list of (lat, lon) coordinates is wrapped
+                into a Polygon
             zoom_level (int): Google Maps zoom level (0-21)
                 - 0: World view
                 - 10: City view
@@ -24,15 +304,29 @@ class MapsScreenshotBot:
                 - 18: Buildings view (default)
                 - 20: Building details
                 - 21: Maximum zoom
+            cache_dir (str): Directory for persistent Chrome profiles, so the
+                HTTP tile cache survives between bots. Temporary if None.
+            image_format (str): Screenshot format, one of IMAGE_FORMATS
         """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"image_format must be one of {sorted(IMAGE_FORMATS)}, got {image_format!r}")
+        self.image_format = image_format
         self.city = city
-        self.boundary_coords = boundary_coords
+        if not isinstance(boundary_coords, Polygon):
+            boundary_coords = Polygon(boundary_coords)
+        self.polygon = boundary_coords
+        self.boundary_coords = boundary_coords.verts
+        # Bounding box and ray-cast vertices are cached on the Polygon
+        self._bbox = boundary_coords.bbox
+        self._px, self._py = boundary_coords.pip_args
         self.zoom_level = min(21, max(0, zoom_level))  # Ensure valid zoom level
-        self.driver = webdriver.Chrome()
-        self.screenshot_path = f"screenshots_{city}_zoom{zoom_level}"
-        
-        if not os.path.exists(self.screenshot_path):
-            os.makedirs(self.screenshot_path)
+        self.cache_dir = cache_dir
+        self._profile_dirs = []
+        self.driver = self._create_driver()
+        self._drivers = {0: self.driver}  # Browser pool by worker index, kept until close()
+        self._no_pan = set()  # Browsers whose Maps app ignored MAP_PAN_JS
+        self._progress_lock = threading.Lock()
+        self.screenshot_path = f"screenshots_{city}_zoom{self.zoom_level}"
     
     def is_within_boundary(self, current_coords):
         """
@@ -44,151 +338,430 @@ class MapsScreenshotBot:
         Returns:
             bool: True if within boundary, False otherwise
         """
-        def point_in_polygon(point, polygon):
-            x, y = point
-            n = len(polygon)
-            inside = False
-            
-            p1x, p1y = polygon[0]
-            for i in range(n + 1):
-                p2x, p2y = polygon[i % n]
-                if y > min(p1y, p2y):
-                    if y <= max(p1y, p2y):
-                        if x <= max(p1x, p2x):
-                            if p1y != p2y:
-                                xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                            if p1x == p2x or x <= xinters:
-                                inside = not inside
-                p1x, p1y = p2x, p2y
-                
-            return inside
-            
-        return point_in_polygon(current_coords, self.boundary_coords)
+        # Cheap bounding box rejection before the full ray cast
+        lat, lon = current_coords
+        lat_min, lat_max, lon_min, lon_max = self._bbox
+        if not (lat_min <= lat <= lat_max and lon_min <= lon <= lon_max):
+            return False
+        
+        return _pip(lat, lon, self._px, self._py)
 
-    def calculate_grid_step(self):
+    def calculate_grid_step(self, zoom_level=None):
         """
         Calculate grid step size based on zoom level
         Higher zoom = smaller step size for more detail
+        
+        The step is the area one screenshot covers less GRID_OVERLAP, so
+        neighbouring screenshots overlap slightly (about 145 x 250 m at
+        zoom 20 for a 1920x1080 viewport).
+        
+        Args:
+            zoom_level (int): Zoom level to size the step for, the current one if None
+            
+        Returns:
+            tuple: (lat_step, lon_step) in degrees
+        """
+        # Web Mercator: 2**zoom tiles of 256 px around the world
+        if zoom_level is None:
+            zoom_level = self.zoom_level
+        lon_per_px = 360.0 / (256 * 2 ** zoom_level)
+        # Vertical scale shrinks with cos(latitude) near the boundary
+        lat_per_px = lon_per_px * math.cos(math.radians(self.polygon.centroid[0]))
+        
+        width, height = VIEWPORT_SIZE
+        scale = 1.0 - GRID_OVERLAP
+        return lat_per_px * height * scale, lon_per_px * width * scale
+    
+    def _contains(self, lat, lon):
+        """Vectorized boundary test, using the half-plane form when it exists"""
+        if self.polygon.halfplanes is not None:
+            return points_in_convex(lat, lon, self.polygon.halfplanes)
+        return points_in_polygon(lat, lon, self.boundary_coords)
+    
+    def _grid_points(self, grid_size=None, zoom_level=None):
+        """
+        Screenshot centres for a zoom level, the current one if None
+        
+        By default the bounding box is split into cells of at most one
+        grid step, and every cell that overlaps the boundary gets a point
+        at its centre, so edge cells whose centre lies outside are still
+        photographed.
+        
+        Args:
+            grid_size (int): Fixed number of grid points per axis; only
+                points inside the boundary are kept
+            
+        Returns:
+            np.ndarray: (n, 2) (lat, lon) points in row-major order
+        """
+        # Area bounds are cached in __init__
+        lat_min, lat_max, lon_min, lon_max = self._bbox
+        
+        if grid_size is not None:
+            lat_steps = np.linspace(lat_min, lat_max, grid_size)
+            lon_steps = np.linspace(lon_min, lon_max, grid_size)
+            LAT, LON = np.meshgrid(lat_steps, lon_steps, indexing="ij")
+            pts = np.column_stack([LAT.ravel(), LON.ravel()])
+            return pts[self._contains(pts[:, 0], pts[:, 1])]
+        
+        # Calculate step sizes based on zoom level
+        lat_step, lon_step = self.calculate_grid_step(zoom_level)
+        n_lat = max(1, int(math.ceil((lat_max - lat_min) / lat_step)))
+        n_lon = max(1, int(math.ceil((lon_max - lon_min) / lon_step)))
+        lat_edges = np.linspace(lat_min, lat_max, n_lat + 1)
+        lon_edges = np.linspace(lon_min, lon_max, n_lon + 1)
+        
+        # A cell overlaps the boundary if one of its corners is inside or
+        # a boundary edge passes through it (which covers vertices inside)
+        LAT, LON = np.meshgrid(lat_edges, lon_edges, indexing="ij")
+        corners = self._contains(LAT.ravel(), LON.ravel()).reshape(LAT.shape)
+        keep = corners[:-1, :-1] | corners[1:, :-1] | corners[:-1, 1:] | corners[1:, 1:]
+        keep |= edges_cross_cells(self.boundary_coords, lat_edges, lon_edges)
+        
+        # Row-major order keeps consecutive jobs on neighbouring tiles
+        rows, cols = np.nonzero(keep)
+        return np.column_stack([
+            (lat_edges[rows] + lat_edges[rows + 1]) / 2,
+            (lon_edges[cols] + lon_edges[cols + 1]) / 2,
+        ])
+    
+    def _create_driver(self, worker=0):
+        """
+        Start a headless Chrome instance with its own profile directory
+        
+        Args:
+            worker (int): Worker index, selects the profile under cache_dir
+        """
+        # Chrome locks its profile, so parallel instances cannot share one
+        if self.cache_dir:
+            profile_dir = os.path.join(self.cache_dir, f"worker{worker}")
+            os.makedirs(profile_dir, exist_ok=True)
+        else:
+            profile_dir = tempfile.mkdtemp(prefix=f"botmap_{self.city}_")
+            self._profile_dirs.append(profile_dir)
+        
+        options = webdriver.ChromeOptions()
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        # Headless viewport capture is cheaper than grabbing the desktop
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={VIEWPORT_SIZE[0]},{VIEWPORT_SIZE[1]}")
+        options.add_argument("--hide-scrollbars")
+        return webdriver.Chrome(options=options)
+    
+    def _load_page(self, driver, url, retries):
         """
-        # Base step sizes at zoom level 18
-        base_lat_step = 0.001  # Approximately 111 meters
-        base_lon_step = 0.001
+        Full page load of url, backing off while Google rate limits us
         
-        # Adjust step size based on zoom level difference
-        zoom_factor = 2 ** (18 - self.zoom_level)
-        return base_lat_step * zoom_factor, base_lon_step * zoom_factor
+        Returns:
+            bool: False if still rate limited after all retries
+        """
+        for attempt in range(retries + 1):
+            driver.get(url)
+            if "/sorry/" not in driver.current_url:
+                return True
+            if attempt == retries:
+                break
+            # Google answers too many requests (429) with its "sorry" page
+            delay = 2 ** attempt + random.uniform(0, 1)
+            print(f"Warning: Rate limited, retrying {url} in {delay:.1f}s")
+            time.sleep(delay)
+        print(f"Warning: Still rate limited after {retries} retries: {url}")
+        return False
     
-    def navigate_to_position(self, lat, lon):
-        """Navigate to specific coordinates with custom zoom level"""
+    def navigate_to_position(self, lat, lon, driver=None, retries=5):
+        """
+        Navigate to specific coordinates with custom zoom level
+        
+        Returns:
+            bool: False if the map could not be shown (rate limited)
+        """
+        driver = driver or self.driver
         url = f"https://www.google.com/maps/@{lat},{lon},{self.zoom_level}z"
-        self.driver.get(url)
-        time.sleep(2)  # Wait for map to load   
         
-        # Ensure map is fully loaded at desired zoom
+        # Reuse the loaded Maps app; only the first visit pays a full page load
+        panned = False
+        if driver not in self._no_pan and driver.current_url.startswith("https://www.google.com/maps"):
+            try:
+                driver.execute_script(MAP_PAN_JS, url)
+                panned = True
+            except WebDriverException:
+                pass
+        if not panned and not self._load_page(driver, url, retries):
+            return False
+        self._wait_for_map(driver, lat, lon)
+        
+        # The pan script cannot tell whether Maps followed it; reload if not
+        if panned and not self._camera_at(driver, url, lat, lon):
+            print("Warning: Maps ignored the in-page move, using full page loads")
+            self._no_pan.add(driver)
+            if not self._load_page(driver, url, retries):
+                return False
+            self._wait_for_map(driver, lat, lon)
+        return True
+    
+    def _wait_for_map(self, driver, lat, lon):
+        """Wait until the map tiles have actually finished loading"""
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "gm-style"))
-            )
-        except:
+            WebDriverWait(driver, 10).until(lambda d: d.execute_script(MAP_READY_JS))
+        except TimeoutException:
             print(f"Warning: Map loading timeout at coordinates: {lat}, {lon}")
     
-    def scan_city(self, grid_size=10):
+    def _camera_at(self, driver, pushed_url, lat, lon):
+        """
+        Check that the Maps app moved its camera to (lat, lon) after a pan
+        
+        Once the camera settles, Maps rewrites the URL with its own rounded
+        centre. A URL still equal to the pushed one means the app ignored it.
+        """
+        current = driver.current_url
+        if current == pushed_url:
+            return False
+        match = MAP_CENTER_RE.search(current)
+        if not match:
+            return False
+        # Two screen pixels: looser than Maps' own rounding, far tighter
+        # than the distance between grid points
+        tolerance = 2 * 360.0 / (256 * 2 ** self.zoom_level)
+        return abs(float(match[1]) - lat) <= tolerance and abs(float(match[2]) - lon) <= tolerance
+    
+    def _save_screenshot(self, filename, png):
+        """Encode the browser's PNG bytes and write them to disk; runs on a writer thread"""
+        _, pil_format, options = IMAGE_FORMATS[self.image_format]
+        try:
+            if pil_format is None:
+                with open(filename, "wb") as f:
+                    f.write(png)
+            else:
+                image = Image.open(io.BytesIO(png)).convert("RGB")
+                image.save(filename, pil_format, **options)
+        except OSError as e:
+            print(f"Warning: Could not save screenshot {filename}: {e}")
+    
+    def _ensure_pool(self, n_workers):
+        """
+        Start browsers until the pool holds n_workers of them
+        
+        Returns:
+            list: (worker, driver) pairs of the first n_workers browsers
+        """
+        worker = 0
+        while len(self._drivers) < n_workers:
+            if worker not in self._drivers:
+                self._drivers[worker] = self._create_driver(worker)
+            worker += 1
+        self.driver = self._drivers[min(self._drivers)]
+        return sorted(self._drivers.items())[:n_workers]
+    
+    def _worker_count(self, workers):
+        """Number of parallel browsers to use, defaults to half the CPU count"""
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 2) // 2)
+        return workers
+    
+    def _pool_size(self, workers, n_points):
+        """Browsers a scan of n_points actually uses: no more than one per point"""
+        return max(1, min(workers, n_points))
+    
+    def warm_up(self, lat, lon, scan_zoom=None, grid_size=None, workers=None):
+        """
+        Load one view at the current zoom in every browser the next scan uses
+        
+        Each browser has its own profile and HTTP cache, so each of them is
+        warmed, all at the same time, starting the pool if needed. A browser
+        that fails here is dropped; the scan starts a new one.
+        
+        Args:
+            lat (float): Latitude of the view, e.g. the polygon centroid
+            lon (float): Longitude of the view
+            scan_zoom (int): Zoom level of the next scan_city() call; the pool
+                is sized to its number of points like scan_city() does
+            grid_size (int): grid_size of the next scan_city() call
+            workers (int): Maximum number of browsers, defaults to half the CPU count
+        """
+        workers = self._worker_count(workers)
+        if scan_zoom is not None or grid_size is not None:
+            workers = self._pool_size(workers, len(self._grid_points(grid_size, scan_zoom)))
+        
+        pool = self._ensure_pool(workers)
+        with ThreadPoolExecutor(max_workers=len(pool)) as executor:
+            futures = [
+                (worker, executor.submit(self.navigate_to_position, lat, lon, driver))
+                for worker, driver in pool
+            ]
+        for worker, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Warning: Browser {worker} failed during warm-up: {e!r}")
+                self._drop_driver(worker)
+    
+    def _drop_driver(self, worker):
+        """Remove a failed browser from the pool, quitting it if it still responds"""
+        driver = self._drivers.pop(worker, None)
+        if driver is not None:
+            self._no_pan.discard(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.driver = self._drivers[min(self._drivers)] if self._drivers else None
+    
+    def _capture_worker(self, worker, driver, jobs, writer, failures):
+        """
+        Take screenshots with one browser until the job queue is empty
+        
+        A point that fails is put back on the queue for the other browsers,
+        or skipped after POINT_ATTEMPTS failures, and this worker stops;
+        the error is appended to failures.
+        
+        Args:
+            worker (int): Index of this worker's browser in the pool
+            driver (webdriver.Chrome): Browser owned by this worker
+            jobs (queue.Queue): Shared queue of (index, lat, lon, tries) points
+            writer (ThreadPoolExecutor): Saves screenshots in the background
+            failures (list): Collects (worker, exception) of failed workers
+        """
+        # Filename parts that are the same for the whole scan
+        prefix = f"{self.city}_"
+        suffix = f"_z{self.zoom_level}_{self._timestamp}_"
+        extension = IMAGE_FORMATS[self.image_format][0]
+        while True:
+            try:
+                idx, lat, lon, tries = jobs.get_nowait()
+            except queue.Empty:
+                return
+            
+            try:
+                # Navigate to position with custom zoom; never save the
+                # rate-limit page in place of a map
+                shown = self.navigate_to_position(lat, lon, driver)
+                
+                # Screenshot only this browser's viewport; writing it to disk
+                # overlaps with the next navigation
+                png = driver.get_screenshot_as_png() if shown else None
+            except Exception as e:
+                failures.append((worker, e))
+                print(f"Warning: Browser {worker} failed at coordinates: {lat}, {lon}: {e!r}")
+                if tries + 1 < POINT_ATTEMPTS:
+                    jobs.put((idx, lat, lon, tries + 1))
+                else:
+                    # The point itself keeps breaking browsers; stop retrying it
+                    print(f"Warning: Skipping coordinates after {POINT_ATTEMPTS} failed attempts: {lat}, {lon}")
+                    self._count_progress()
+                return
+            
+            if png is None:
+                print(f"Warning: Skipping coordinates: {lat}, {lon}")
+            else:
+                filename = self._screenshot_dir / f"{prefix}{lat:.6f}_{lon:.6f}{suffix}{idx:05d}{extension}"
+                writer.submit(self._save_screenshot, filename, png)
+            
+            self._count_progress()
+    
+    def _count_progress(self):
+        """Count one finished point and print the scan progress"""
+        with self._progress_lock:
+            self._processed_points += 1
+            progress = (self._processed_points / self._total_points) * 100
+            print(f"Progress: {progress:.1f}% ({self._processed_points}/{self._total_points})")
+    
+    def scan_city(self, grid_size=None, zoom_level=None, workers=None):
         """
         Scan city area taking screenshots with specified zoom level
         
+        By default grid spacing follows calculate_grid_step(), about one
+        viewport per point, so the number of points grows with the
+        boundary's area and 4x per zoom level. Browsers stay open between
+        calls; call close() when done. A browser that fails is dropped
+        from the pool and its point retried by the others, up to
+        POINT_ATTEMPTS times; RuntimeError is raised if every browser fails.
+        
         Args:
-            grid_size (int): Size of grid to divide city into
+            grid_size (int): Fixed number of grid points per axis instead of
+                the viewport-sized step
+            zoom_level (int): Zoom level for this scan, keeps the current one if None
+            workers (int): Number of parallel browsers, defaults to half the CPU count
         """
+        if zoom_level is not None:
+            self.zoom_level = min(21, max(0, zoom_level))  # Ensure valid zoom level
+            self.screenshot_path = f"screenshots_{self.city}_zoom{self.zoom_level}"
+        workers = self._worker_count(workers)
+        
+        jobs = queue.Queue()
+        threads = []
+        writer = ThreadPoolExecutor(max_workers=workers)
         try:
-            # Calculate area bounds and convert to float
-            lat_min = float(min(coord[0] for coord in self.boundary_coords))
-            lat_max = float(max(coord[0] for coord in self.boundary_coords))
-            lon_min = float(min(coord[1] for coord in self.boundary_coords))
-            lon_max = float(max(coord[1] for coord in self.boundary_coords))
+            self._screenshot_dir = Path(self.screenshot_path)
+            self._screenshot_dir.mkdir(parents=True, exist_ok=True)
+            # One timestamp per scan; the point index keeps filenames unique
+            self._timestamp = time.strftime("%Y%m%d-%H%M%S")
             
-            # Calculate step sizes based on zoom level
-            lat_step, lon_step = self.calculate_grid_step()
+            pts = self._grid_points(grid_size)
             
-            # Adjust grid size based on zoom level
-            actual_grid_size = grid_size * (2 ** (self.zoom_level - 18))
+            for idx, (lat, lon) in enumerate(pts):
+                jobs.put((idx, lat, lon, 0))
+            self._total_points = len(pts)
+            self._processed_points = 0
             
-            lat_steps = np.linspace(lat_min, lat_max, actual_grid_size)
-            lon_steps = np.linspace(lon_min, lon_max, actual_grid_size)
+            # One browser per worker; the first one is self.driver. Browsers
+            # started by earlier scans are reused with their warm cache.
+            pool = self._ensure_pool(self._pool_size(workers, len(pts)))
             
-            total_points = len(lat_steps) * len(lon_steps)
-            processed_points = 0
+            # Failed browsers leave the pool; their points go to the rest.
+            # Every round either empties the queue or loses a browser.
+            while pool:
+                failures = []
+                round_threads = []
+                for worker, driver in pool:
+                    thread = threading.Thread(
+                        target=self._capture_worker,
+                        args=(worker, driver, jobs, writer, failures),
+                    )
+                    thread.start()
+                    round_threads.append(thread)
+                threads.extend(round_threads)
+                for thread in round_threads:
+                    thread.join()
+                
+                for worker, _ in failures:
+                    self._drop_driver(worker)
+                if jobs.empty():
+                    break
+                pool = [(worker, driver) for worker, driver in pool if worker in self._drivers]
             
-            for lat in lat_steps:
-                for lon in lon_steps:
-                    if self.is_within_boundary((lat, lon)):
-                        # Navigate to position with custom zoom
-                        self.navigate_to_position(lat, lon)
-                        
-                        # Take screenshot
-                        timestamp = time.strftime("%Y%m%d-%H%M%S")
-                        filename = f"{self.screenshot_path}/{self.city}_{lat}_{lon}_z{self.zoom_level}_{timestamp}.png"
-                        screenshot = pyautogui.screenshot()
-                        screenshot.save(filename)
-                        
-                        # Progress update
-                        processed_points += 1
-                        progress = (processed_points / total_points) * 100
-                        print(f"Progress: {progress:.1f}% ({processed_points}/{total_points})")
-                        
-                        # Optional: Add small delay to prevent rate limiting
-                        time.sleep(1)
+            if not jobs.empty():
+                raise RuntimeError(
+                    f"All browsers failed, {jobs.qsize()} of {self._total_points} points not captured"
+                ) from failures[0][1]
             
         finally:
-            self.driver.quit()
-
-# Contoh penggunaan dengan berbagai zoom level
-def create_detailed_map(city_name, boundary_coords):
-    """
-    Membuat screenshot dengan berbagai tingkat detail
-    """
-    zoom_levels = {
-        "overview": 16,      # Area overview
-        "streets": 18,       # Street level detail
-        "buildings": 19,     # Building detail
-        "maximum": 20        # Maximum detail
-    }
+            # On error, drop pending points so workers stop after their current one
+            while not jobs.empty():
+                try:
+                    jobs.get_nowait()
+                except queue.Empty:
+                    break
+            for thread in threads:
+                thread.join()
+            writer.shutdown(wait=True)
     
-    for level_name, zoom in zoom_levels.items():
-        print(f"\nStarting {level_name} scan at zoom level {zoom}")
-        bot = MapsScreenshotBot(city_name, boundary_coords, zoom_level=zoom)
-        bot.scan_city(grid_size=10)
+    def close(self):
+        """Quit all browsers and remove their temporary profiles"""
+        for driver in self._drivers.values():
+            # A crashed browser must not keep the others running
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Warning: Could not quit browser: {e!r}")
+        self._drivers = {}
+        self._no_pan = set()
+        self.driver = None
+        for profile_dir in self._profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self._profile_dirs = []
 
-# Example usage
-if __name__ == "__main__":
-    # Example coordinates for Surabaya (simplified boundary)
-    surabaya_boundary = [
-    # Surabaya Utara (sekitar Pelabuhan Tanjung Perak)
-    (-7.1955, 112.7321),  # Pelabuhan Tanjung Perak
-    (-7.1891, 112.7445),  # Ujung
-    (-7.2023, 112.7667),  # Kenjeran
-    
-    # Surabaya Timur
-    (-7.2284, 112.7912),  # Sukolilo
-    (-7.2567, 112.8023),  # Rungkut
-    (-7.2789, 112.7989),  # Gunung Anyar
-    (-7.3012, 112.7867),  # Tambaksari
-    
-    # Surabaya Selatan
-    (-7.3234, 112.7654),  # Gayungan
-    (-7.3345, 112.7445),  # Wiyung
-    (-7.3256, 112.7234),  # Karang Pilang
-    
-    # Surabaya Barat
-    (-7.2867, 112.6789),  # Lakarsantri
-    (-7.2567, 112.6654),  # Benowo
-    (-7.2334, 112.6789),  # Tandes
-    (-7.2123, 112.6912),  # Asemrowo
-    
-    # Kembali ke titik awal untuk menutup polygon
-    (-7.1955, 112.7321)   # Pelabuhan Tanjung Perak
-]
-    
-    SURABAYA_KELURAHAN_BOUNDARIES = {
+
+SURABAYA_KELURAHAN_BOUNDARIES = {
     # SURABAYA PUSAT
     "Kecamatan Bubutan": {
         "Alun-alun Contong": [
@@ -289,8 +862,115 @@ if __name__ == "__main__":
             (-7.3278, 112.7845)
         ]
     },
+}
+
+# Polygon kelurahan (array float64 contiguous + bbox), dihitung sekali saat load
+BOUNDARIES_NP = {
+    kecamatan: {
+        name: Polygon(coords)
+        for name, coords in kelurahan.items()
+    }
+    for kecamatan, kelurahan in SURABAYA_KELURAHAN_BOUNDARIES.items()
+}
+
+# Semua polygon kelurahan dalam satu list datar: (kecamatan, kelurahan, Polygon)
+KELURAHAN_POLYGONS = [
+    (kecamatan, name, polygon)
+    for kecamatan, kelurahan in BOUNDARIES_NP.items()
+    for name, polygon in kelurahan.items()
+]
+
+# R-tree atas bounding box tiap polygon, (lat_min, lon_min, lat_max, lon_max).
+# Dibangun dari generator supaya libspatialindex memakai bulk-load STR
+# (tree lebih rapat) alih-alih insert satu per satu.
+KELURAHAN_INDEX = rtree.index.Index(
+    ((i, (polygon.bbox[0], polygon.bbox[2], polygon.bbox[1], polygon.bbox[3]), None)
+     for i, (_, _, polygon) in enumerate(KELURAHAN_POLYGONS)),
+    properties=rtree.index.Property(leaf_capacity=32, fill_factor=0.9),
+) if rtree is not None else None
+
+
+def kelurahan_containing(point):
+    """
+    Find the kelurahan whose boundary contains a point
+    
+    Args:
+        point (tuple): Latitude and longitude
+        
+    Returns:
+        tuple: (kecamatan, kelurahan) names, or None if outside all of them
+    """
+    lat, lon = point
+    if KELURAHAN_INDEX is not None:
+        # Only polygons whose bounding box contains the point need a ray cast
+        candidates = KELURAHAN_INDEX.intersection((lat, lon, lat, lon))
+    else:
+        candidates = range(len(KELURAHAN_POLYGONS))
+    
+    for i in candidates:
+        kecamatan, name, polygon = KELURAHAN_POLYGONS[i]
+        if _pip(lat, lon, *polygon.pip_args):
+            return kecamatan, name
+    return None
+
+
+# Contoh penggunaan dengan berbagai zoom level
+def create_detailed_map(city_name, boundary_coords):
+    """
+    Membuat screenshot dengan berbagai tingkat detail
+    """
+    zoom_levels = {
+        "overview": 16,      # Area overview
+        "streets": 18,       # Street level detail
+        "buildings": 19,     # Building detail
+        "maximum": 20        # Maximum detail
     }
+    
+    # Satu bot (dan satu set Chrome) untuk semua zoom level, dengan profil
+    # persisten agar cache tile tetap ada antar zoom level
+    cache_dir = os.path.join(tempfile.gettempdir(), f"botmap_cache_{city_name}")
+    bot = MapsScreenshotBot(city_name, boundary_coords, zoom_level=14, cache_dir=cache_dir)
+    try:
+        # Warm-up: buka overview zoom 14 di setiap browser yang dipakai scan
+        # pertama untuk mengisi cache tile induk (tiap browser punya profil
+        # dan cache sendiri)
+        bot.warm_up(*bot.polygon.centroid, scan_zoom=zoom_levels["overview"])
+        
+        for level_name, zoom in zoom_levels.items():
+            print(f"\nStarting {level_name} scan at zoom level {zoom}")
+            bot.scan_city(zoom_level=zoom)
+    finally:
+        bot.close()
 
+# Example usage
+if __name__ == "__main__":
+    # Example coordinates for Surabaya (simplified boundary)
+    surabaya_boundary = [
+    # Surabaya Utara (sekitar Pelabuhan Tanjung Perak)
+    (-7.1955, 112.7321),  # Pelabuhan Tanjung Perak
+    (-7.1891, 112.7445),  # Ujung
+    (-7.2023, 112.7667),  # Kenjeran
+    
+    # Surabaya Timur
+    (-7.2284, 112.7912),  # Sukolilo
+    (-7.2567, 112.8023),  # Rungkut
+    (-7.2789, 112.7989),  # Gunung Anyar
+    (-7.3012, 112.7867),  # Tambaksari
+    
+    # Surabaya Selatan
+    (-7.3234, 112.7654),  # Gayungan
+    (-7.3345, 112.7445),  # Wiyung
+    (-7.3256, 112.7234),  # Karang Pilang
+    
+    # Surabaya Barat
+    (-7.2867, 112.6789),  # Lakarsantri
+    (-7.2567, 112.6654),  # Benowo
+    (-7.2334, 112.6789),  # Tandes
+    (-7.2123, 112.6912),  # Asemrowo
+    
+    # Polygon ditutup otomatis kembali ke titik awal
+]
+    
     gunung_anyar = [
         (-7.3323, 112.7867),
         (-7.3301, 112.7934),
@@ -300,4 +980,7 @@ if __name__ == "__main__":
     ]
     
     bot = MapsScreenshotBot("Surabaya", surabaya_boundary, zoom_level=20)
-    bot.scan_city(grid_size=20)
+    try:
+        bot.scan_city()
+    finally:
+        bot.close()